@@ -1,3 +1,4 @@
+import hashlib
 import json
 import logging
 from typing import Optional, Any, Callable
@@ -6,12 +7,19 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
 
 from ..db import get_conn
+from ..dedupe import CANONICAL_ONLY
 from ..geo import bbox, haversine_km
+from ..ranking import SORT_PATTERN, top_k
 from ..settings import (
     BACKBOARD_API_KEY,
     BACKBOARD_API_URL,
+    BACKBOARD_MAX_CONCURRENCY,
+    BACKBOARD_MAX_QUEUE,
     BACKBOARD_MODEL,
+    BACKBOARD_QUEUE_TIMEOUT_S,
+    BACKBOARD_RETRY_AFTER_S,
 )
+from ..singleflight import ConcurrencyLimiter, Overloaded, SingleFlight
 
 try:
     from backboard import BackboardClient  # type: ignore
@@ -21,6 +29,11 @@ except Exception:
 router = APIRouter()
 logger = logging.getLogger("caremap.backboard")
 
+# Upstream LLM calls are slow and expensive: identical concurrent requests share
+# one call, and the number of calls in progress is capped.
+_singleflight = SingleFlight()
+_limiter = ConcurrencyLimiter(BACKBOARD_MAX_CONCURRENCY, BACKBOARD_MAX_QUEUE, BACKBOARD_QUEUE_TIMEOUT_S)
+
 
 class BackboardRequest(BaseModel):
     query: str = Field(..., min_length=1, description="End-user question")
@@ -29,15 +42,28 @@ class BackboardRequest(BaseModel):
     radius_km: float = Field(3.0, ge=0.1, le=50.0)
     limit: int = Field(15, ge=1, le=100)
     category: Optional[str] = Field(None, description="Optional category filter")
-
-
-def _nearby_places(latitude: float, longitude: float, radius_km: float, limit: int, category: Optional[str]):
+    # Relevance by default so the LLM sees the most useful places, not just the closest.
+    sort: str = Field("relevance", pattern=SORT_PATTERN, description="relevance (default) or distance")
+    prefer_category: Optional[str] = Field(None, description="Category to boost when sort=relevance")
+
+
+def _nearby_places(
+    latitude: float,
+    longitude: float,
+    radius_km: float,
+    limit: int,
+    category: Optional[str],
+    sort: str = "distance",
+    prefer_category: Optional[str] = None,
+):
     lat_min, lat_max, lon_min, lon_max = bbox(latitude, longitude, radius_km)
 
-    q = """
-      SELECT id, name, category, address, latitude, longitude, phone, website, last_verified
+    q = f"""
+      SELECT id, name, category, address, latitude, longitude, phone, website, hours_json, last_verified,
+             raw_hours, winter_response
       FROM places
       WHERE latitude IS NOT NULL AND longitude IS NOT NULL
+        AND {CANONICAL_ONLY}
         AND latitude BETWEEN ? AND ?
         AND longitude BETWEEN ? AND ?
     """
@@ -51,27 +77,27 @@ def _nearby_places(latitude: float, longitude: float, radius_km: float, limit: i
     rows = conn.execute(q, params).fetchall()
     conn.close()
 
-    scored = []
+    candidates = []
     for r in rows:
         d = haversine_km(latitude, longitude, r["latitude"], r["longitude"])
         if d <= radius_km:
-            scored.append(
-                {
-                    "id": r["id"],
-                    "name": r["name"],
-                    "category": r["category"],
-                    "address": r["address"],
-                    "latitude": r["latitude"],
-                    "longitude": r["longitude"],
-                    "distance_km": round(d, 3),
-                    "phone": r["phone"],
-                    "website": r["website"],
-                    "last_verified": r["last_verified"],
-                }
-            )
-
-    scored.sort(key=lambda x: x["distance_km"])
-    return scored[:limit]
+            candidates.append((d, r))
+
+    return [
+        {
+            "id": r["id"],
+            "name": r["name"],
+            "category": r["category"],
+            "address": r["address"],
+            "latitude": r["latitude"],
+            "longitude": r["longitude"],
+            "distance_km": round(d, 3),
+            "phone": r["phone"],
+            "website": r["website"],
+            "last_verified": r["last_verified"],
+        }
+        for d, r in top_k(candidates, limit, sort, radius_km, prefer_category)
+    ]
 
 
 @router.post("/backboard")
@@ -79,7 +105,15 @@ async def backboard_chat(req: BackboardRequest):
     if not BACKBOARD_API_KEY:
         raise HTTPException(status_code=500, detail="Backboard API key not configured")
 
-    context_places = _nearby_places(req.latitude, req.longitude, req.radius_km, req.limit, req.category)
+    context_places = _nearby_places(
+        req.latitude,
+        req.longitude,
+        req.radius_km,
+        req.limit,
+        req.category,
+        req.sort,
+        req.prefer_category,
+    )
 
     context_payload = {
         "user_location": {"latitude": req.latitude, "longitude": req.longitude, "radius_km": req.radius_km},
@@ -89,8 +123,21 @@ async def backboard_chat(req: BackboardRequest):
     if BackboardClient is None:
         raise HTTPException(status_code=500, detail="Backboard SDK not installed. Run: pip install backboard-sdk")
 
+    async def _limited_call():
+        async with _limiter.slot():
+            return await _call_backboard_sdk(system_prompt, req.query)
+
+    # Key on exactly what goes upstream, so only truly identical calls coalesce.
+    key = hashlib.sha256(f"{system_prompt}\0{req.query}".encode("utf-8")).hexdigest()
     try:
-        data = await _call_backboard_sdk(system_prompt, req.query)
+        data = await _singleflight.do(key, _limited_call)
+    except Overloaded as e:
+        logger.warning(f"Shedding /backboard request: {e}")
+        raise HTTPException(
+            status_code=503,
+            detail="Assistant is busy, please retry shortly",
+            headers={"Retry-After": str(BACKBOARD_RETRY_AFTER_S)},
+        ) from e
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"Backboard SDK request error: {e}") from e
 
@@ -111,6 +158,19 @@ async def backboard_chat(req: BackboardRequest):
     }
 
 
+@router.get("/backboard/stats")
+def backboard_stats():
+    return {
+        "in_flight": _limiter.in_flight,
+        "queued": _limiter.queued,
+        "max_concurrency": _limiter.max_concurrency,
+        "max_queue": _limiter.max_queue,
+        "shed_total": _limiter.shed_total,
+        "coalesced_total": _singleflight.coalesced_total,
+        "singleflight_keys": _singleflight.keys_in_flight,
+    }
+
+
 def _build_system_prompt(context_payload: dict) -> str:
     context_str = _escape_template(json.dumps(context_payload, ensure_ascii=False))
     return (
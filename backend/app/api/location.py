@@ -1,10 +1,20 @@
-import json
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, HTTPException, Query
 from typing import Optional
 
+from ..columnar import columnar_response
+from ..clusters import MIN_ZOOM, MAX_ZOOM, query_clusters
 from ..db import get_conn
+from ..dedupe import CANONICAL_ONLY
 from ..geo import haversine_km, bbox
-from ..models import Place
+from ..ranking import SORT_PATTERN, top_k
+from ..models import (
+    Cluster,
+    NearbyBatchRequest,
+    NearbyBatchResponse,
+    NearbyHit,
+    Place,
+    place_from_row,
+)
 
 router = APIRouter()
 
@@ -15,13 +25,18 @@ def nearby_locations(
     radius_km: float = Query(3.0, ge=0.1, description="Search radius in kilometers (default 3km)"),
     limit: int = Query(50, ge=1, le=200),
     category: Optional[str] = Query(None, description="Optional category filter"),
+    sort: str = Query("distance", pattern=SORT_PATTERN, description="distance (default) or relevance"),
+    prefer_category: Optional[str] = Query(None, description="Category to boost when sort=relevance"),
+    format: str = Query("json", pattern="^(json|columnar)$", description="Response encoding: json (default) or columnar"),
 ):
     lat_min, lat_max, lon_min, lon_max = bbox(latitude, longitude, radius_km)
 
-    q = """
-      SELECT id, name, category, address, latitude, longitude, phone, website, hours_json, last_verified
+    q = f"""
+      SELECT id, name, category, address, latitude, longitude, phone, website, hours_json, last_verified,
+             raw_hours, winter_response
       FROM places
       WHERE latitude IS NOT NULL AND longitude IS NOT NULL
+        AND {CANONICAL_ONLY}
         AND latitude BETWEEN ? AND ?
         AND longitude BETWEEN ? AND ?
     """
@@ -41,24 +56,71 @@ def nearby_locations(
         if d <= radius_km:
             scored.append((d, r))
 
-    scored.sort(key=lambda x: x[0])
-    scored = scored[:limit]
-
-    out: list[Place] = []
-    for _, r in scored:
-        hours = json.loads(r["hours_json"]) if r["hours_json"] else None
-        out.append(
-            Place(
-                id=r["id"],
-                name=r["name"],
-                category=r["category"],
-                address=r["address"],
-                latitude=r["latitude"],
-                longitude=r["longitude"],
-                phone=r["phone"],
-                website=r["website"],
-                hours=hours,
-                last_verified=r["last_verified"],
-            )
-        )
+    scored = top_k(scored, limit, sort, radius_km, prefer_category)
+
+    out = [place_from_row(r) for _, r in scored]
+    if format == "columnar":
+        return columnar_response(out)
     return out
+
+@router.post("/location/nearby/batch", response_model=NearbyBatchResponse)
+def nearby_locations_batch(req: NearbyBatchRequest):
+    """
+    Nearby places for many origins at once.
+
+    All origins share a single candidate scan (one query over the union of their
+    bounding boxes) and each matching place is built and serialized once, no
+    matter how many origins it is near.
+    """
+    boxes = [bbox(o.latitude, o.longitude, req.radius_km) for o in req.origins]
+
+    q = f"""
+      SELECT id, name, category, address, latitude, longitude, phone, website, hours_json, last_verified,
+             raw_hours, winter_response
+      FROM places
+      WHERE latitude IS NOT NULL AND longitude IS NOT NULL
+        AND {CANONICAL_ONLY}
+    """
+    q += " AND (" + " OR ".join(["(latitude BETWEEN ? AND ? AND longitude BETWEEN ? AND ?)"] * len(boxes)) + ")"
+    params: list = [v for b in boxes for v in b]
+
+    if req.category:
+        q += " AND category = ?"
+        params.append(req.category)
+
+    conn = get_conn()
+    rows = conn.execute(q, params).fetchall()
+    conn.close()
+
+    per_origin: list[list[tuple[float, object]]] = [[] for _ in req.origins]
+    for r in rows:
+        lat, lon = r["latitude"], r["longitude"]
+        for i, (o, (lat_min, lat_max, lon_min, lon_max)) in enumerate(zip(req.origins, boxes)):
+            if not (lat_min <= lat <= lat_max and lon_min <= lon <= lon_max):
+                continue
+            d = haversine_km(o.latitude, o.longitude, lat, lon)
+            if d <= req.radius_km:
+                per_origin[i].append((d, r))
+
+    results: list[list[NearbyHit]] = []
+    keep: dict[int, object] = {}
+    for candidates in per_origin:
+        hits = top_k(candidates, req.limit, req.sort, req.radius_km, req.prefer_category)
+        keep.update((r["id"], r) for _, r in hits)
+        results.append([NearbyHit(id=r["id"], distance_km=round(d, 3)) for d, r in hits])
+
+    places = {pid: place_from_row(r) for pid, r in keep.items()}
+    return NearbyBatchResponse(places=places, results=results)
+
+@router.get("/location/clusters", response_model=list[Cluster])
+def location_clusters(
+    min_lat: float = Query(..., ge=-90, le=90),
+    min_lon: float = Query(..., ge=-180, le=180),
+    max_lat: float = Query(..., ge=-90, le=90),
+    max_lon: float = Query(..., ge=-180, le=180),
+    zoom: int = Query(..., ge=MIN_ZOOM, le=MAX_ZOOM, description="Map zoom level"),
+):
+    if min_lat > max_lat or min_lon > max_lon:
+        raise HTTPException(status_code=400, detail="min_lat/min_lon must not exceed max_lat/max_lon")
+
+    return query_clusters(min_lat, min_lon, max_lat, max_lon, zoom)
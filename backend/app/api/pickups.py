@@ -3,6 +3,8 @@ from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 from typing import Optional
 
+from ..clusters import rebuild_clusters
+from ..columnar import columnar_response
 from ..db import get_conn
 from ..geo import haversine_km, bbox
 from ..settings import PICKUP_PIN
@@ -67,6 +69,7 @@ def create_pickup(p: PickupCreate):
         ),
     )
     conn.commit()
+    rebuild_clusters(conn)
     conn.close()
     return {"ok": True}
 
@@ -76,6 +79,7 @@ def pickups_nearby(
     longitude: float = Query(...),
     radius_km: float = Query(3.0, ge=0.1, description="Search radius in kilometers (default 3km)"),
     limit: int = Query(50, ge=1, le=200),
+    format: str = Query("json", pattern="^(json|columnar)$", description="Response encoding: json (default) or columnar"),
 ):
     lat_min, lat_max, lon_min, lon_max = bbox(latitude, longitude, radius_km)
 
@@ -103,4 +107,6 @@ def pickups_nearby(
             if len(out) >= limit:
                 break
 
+    if format == "columnar":
+        return columnar_response(out)
     return out
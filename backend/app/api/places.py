@@ -0,0 +1,93 @@
+import json
+from fastapi import APIRouter, Query
+from typing import Optional
+
+from ..db import get_conn
+from ..dedupe import CANONICAL_ONLY
+
+router = APIRouter()
+
+# Column order of each row in "upserted"; sent once per response instead of
+# repeating keys on every place.
+CHANGE_FIELDS = [
+    "id", "name", "category", "address", "latitude", "longitude",
+    "phone", "website", "hours", "last_verified", "updated_at",
+]
+
+# Places resolved as duplicates are reported as removed.
+_SELECT = f"""
+  SELECT id, name, category, address, latitude, longitude, phone, website, hours_json, last_verified, updated_at
+  FROM places
+  WHERE {CANONICAL_ONLY}
+"""
+
+def _encode_row(r) -> list:
+    hours = json.loads(r["hours_json"]) if r["hours_json"] else None
+    return [
+        r["id"], r["name"], r["category"], r["address"], r["latitude"], r["longitude"],
+        r["phone"], r["website"], hours, r["last_verified"], r["updated_at"],
+    ]
+
+def _parse_cursor(since: Optional[str]) -> Optional[tuple[str, int]]:
+    """
+    Split a "<epoch>:<seq>" cursor; None if missing or malformed.
+    """
+    if not since:
+        return None
+    epoch, sep, seq = since.partition(":")
+    if not sep or not epoch or not seq.isdigit():
+        return None
+    return epoch, int(seq)
+
+@router.get("/places/changes")
+def place_changes(
+    since: Optional[str] = Query(None, description="Cursor from a previous response; omit for a full snapshot"),
+):
+    """
+    Places added, changed or removed after the `since` cursor.
+
+    Cursors are "<epoch>:<seq>", where epoch identifies this database's change
+    history. With no cursor, a malformed one, one from another epoch (e.g. the
+    database was rebuilt) or one ahead of the log, the full set is returned
+    with reset=true and the client should replace its replica.
+    """
+    conn = get_conn()
+    try:
+        epoch = conn.execute("SELECT epoch FROM sync_state WHERE id = 1").fetchone()[0]
+        seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM place_changes").fetchone()[0]
+
+        parsed = _parse_cursor(since)
+        reset = parsed is None or parsed[0] != epoch or parsed[1] > seq
+        since_seq = 0 if reset else parsed[1]
+
+        if reset:
+            rows = conn.execute(_SELECT + " ORDER BY id").fetchall()
+            removed: list[int] = []
+        else:
+            changed = [
+                r[0]
+                for r in conn.execute(
+                    "SELECT DISTINCT place_id FROM place_changes WHERE seq > ? ORDER BY place_id",
+                    (since_seq,),
+                ).fetchall()
+            ]
+            rows = []
+            if changed:
+                # Join against the change set so the query stays a single statement
+                # regardless of how many ids changed.
+                rows = conn.execute(
+                    _SELECT + " AND id IN (SELECT place_id FROM place_changes WHERE seq > ?) ORDER BY id",
+                    (since_seq,),
+                ).fetchall()
+            present = {r["id"] for r in rows}
+            removed = [pid for pid in changed if pid not in present]
+    finally:
+        conn.close()
+
+    return {
+        "cursor": f"{epoch}:{seq}",
+        "reset": reset,
+        "fields": CHANGE_FIELDS,
+        "upserted": [_encode_row(r) for r in rows],
+        "removed": removed,
+    }
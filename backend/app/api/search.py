@@ -1,9 +1,11 @@
-import json
 from fastapi import APIRouter, Query
 from typing import Optional
 
+from ..columnar import columnar_response
 from ..db import get_conn
-from ..models import Place
+from ..dedupe import CANONICAL_ONLY
+from ..models import Place, Suggestion, place_from_row
+from ..suggest import suggest_index
 
 router = APIRouter()
 
@@ -12,11 +14,12 @@ def search(
     category: Optional[str] = Query(None, description="Category id (e.g., meals, shelter, dropin)"),
     name: Optional[str] = Query(None, description="Partial name match"),
     limit: int = Query(50, ge=1, le=200),
+    format: str = Query("json", pattern="^(json|columnar)$", description="Response encoding: json (default) or columnar"),
 ):
-    q = """
+    q = f"""
       SELECT id, name, category, address, latitude, longitude, phone, website, hours_json, last_verified
       FROM places
-      WHERE 1=1
+      WHERE {CANONICAL_ONLY}
     """
     params: list = []
 
@@ -36,21 +39,18 @@ def search(
     rows = conn.execute(q, params).fetchall()
     conn.close()
 
-    out: list[Place] = []
-    for r in rows:
-        hours = json.loads(r["hours_json"]) if r["hours_json"] else None
-        out.append(
-            Place(
-                id=r["id"],
-                name=r["name"],
-                category=r["category"],
-                address=r["address"],
-                latitude=r["latitude"],
-                longitude=r["longitude"],
-                phone=r["phone"],
-                website=r["website"],
-                hours=hours,
-                last_verified=r["last_verified"],
-            )
-        )
+    out = [place_from_row(r) for r in rows]
+    if format == "columnar":
+        return columnar_response(out)
     return out
+
+@router.get("/search/suggest", response_model=list[Suggestion])
+def search_suggest(
+    q: str = Query(..., min_length=1, description="Text typed so far"),
+    category: Optional[str] = Query(None, description="Optional category filter"),
+    latitude: Optional[float] = Query(None, description="Caller latitude, boosts nearby places"),
+    longitude: Optional[float] = Query(None, description="Caller longitude, boosts nearby places"),
+    limit: int = Query(10, ge=1, le=25),
+):
+    suggest_index.ensure_fresh()
+    return suggest_index.suggest(q, limit, category, latitude, longitude)
@@ -0,0 +1,160 @@
+import json
+import math
+import sqlite3
+from collections import Counter
+from typing import Optional, Tuple
+
+from .db import get_conn
+from .dedupe import CANONICAL_ONLY
+
+# Zoom levels follow the usual web-map tile convention (0 = whole world).
+MIN_ZOOM = 0
+MAX_ZOOM = 18
+
+# Each map tile is split into 2^CELL_SHIFT x 2^CELL_SHIFT grid cells,
+# so at the default of 2 a 256px tile holds 4x4 cells of ~64px each.
+CELL_SHIFT = 2
+
+# Category reported for active pickups in the per-cluster breakdown.
+PICKUP_CATEGORY = "pickup"
+
+_MAX_MERCATOR_LAT = 85.05112878
+
+
+def _grid_xy(lat: float, lon: float) -> Tuple[float, float]:
+    """
+    Normalized Web Mercator coordinates in [0, 1), so cells are square on screen.
+    """
+    lat = max(-_MAX_MERCATOR_LAT, min(_MAX_MERCATOR_LAT, lat))
+    x = (lon + 180.0) / 360.0
+    s = math.sin(math.radians(lat))
+    y = 0.5 - math.log((1 + s) / (1 - s)) / (4 * math.pi)
+    return min(max(x, 0.0), 1 - 1e-12), min(max(y, 0.0), 1 - 1e-12)
+
+
+def cell_for(lat: float, lon: float, zoom: int) -> Tuple[int, int]:
+    x, y = _grid_xy(lat, lon)
+    n = 1 << (zoom + CELL_SHIFT)
+    return int(x * n), int(y * n)
+
+
+def rebuild_clusters(conn: Optional[sqlite3.Connection] = None) -> int:
+    """
+    Rebuild the cluster pyramid from places and active pickups.
+
+    Points are bucketed once at MAX_ZOOM; every coarser level is built by merging
+    the four child cells of the level below, so the whole pyramid costs one pass
+    over the data plus a pass per zoom level over (at most) the occupied cells.
+    Returns the number of cells written.
+    """
+    own_conn = conn is None
+    if own_conn:
+        conn = get_conn()
+
+    try:
+        points = conn.execute(
+            f"""
+            SELECT latitude, longitude, category FROM places
+            WHERE latitude IS NOT NULL AND longitude IS NOT NULL
+              AND {CANONICAL_ONLY}
+            """
+        ).fetchall()
+        pickups = conn.execute(
+            """
+            SELECT latitude, longitude FROM pickups
+            WHERE active = 1 AND latitude IS NOT NULL AND longitude IS NOT NULL
+            """
+        ).fetchall()
+
+        # cell -> [count, sum_lat, sum_lon, Counter(category)]
+        level: dict[Tuple[int, int], list] = {}
+
+        def _add(lat: float, lon: float, category: str) -> None:
+            key = cell_for(lat, lon, MAX_ZOOM)
+            agg = level.get(key)
+            if agg is None:
+                agg = level[key] = [0, 0.0, 0.0, Counter()]
+            agg[0] += 1
+            agg[1] += lat
+            agg[2] += lon
+            agg[3][category] += 1
+
+        for r in points:
+            _add(r["latitude"], r["longitude"], r["category"])
+        for r in pickups:
+            _add(r["latitude"], r["longitude"], PICKUP_CATEGORY)
+
+        rows = []
+        for zoom in range(MAX_ZOOM, MIN_ZOOM - 1, -1):
+            for (cx, cy), (count, sum_lat, sum_lon, cats) in level.items():
+                rows.append((zoom, cx, cy, count, sum_lat, sum_lon, json.dumps(dict(cats))))
+
+            parent: dict[Tuple[int, int], list] = {}
+            for (cx, cy), (count, sum_lat, sum_lon, cats) in level.items():
+                key = (cx >> 1, cy >> 1)
+                agg = parent.get(key)
+                if agg is None:
+                    agg = parent[key] = [0, 0.0, 0.0, Counter()]
+                agg[0] += count
+                agg[1] += sum_lat
+                agg[2] += sum_lon
+                agg[3].update(cats)
+            level = parent
+
+        conn.execute("DELETE FROM place_clusters")
+        conn.executemany(
+            """
+            INSERT INTO place_clusters(zoom, cell_x, cell_y, count, sum_lat, sum_lon, categories_json)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            rows,
+        )
+        conn.commit()
+        return len(rows)
+    finally:
+        if own_conn:
+            conn.close()
+
+
+def query_clusters(
+    min_lat: float,
+    min_lon: float,
+    max_lat: float,
+    max_lon: float,
+    zoom: int,
+) -> list[dict]:
+    """
+    Clusters whose grid cell intersects the viewport at the given zoom level.
+    """
+    zoom = max(MIN_ZOOM, min(MAX_ZOOM, zoom))
+    # Mercator y grows southwards, so the north edge gives the smaller cell_y.
+    x0, y0 = cell_for(max_lat, min_lon, zoom)
+    x1, y1 = cell_for(min_lat, max_lon, zoom)
+
+    conn = get_conn()
+    rows = conn.execute(
+        """
+        SELECT cell_x, cell_y, count, sum_lat, sum_lon, categories_json
+        FROM place_clusters
+        WHERE zoom = ?
+          AND cell_x BETWEEN ? AND ?
+          AND cell_y BETWEEN ? AND ?
+        """,
+        (zoom, x0, x1, y0, y1),
+    ).fetchall()
+    conn.close()
+
+    out = []
+    for r in rows:
+        out.append(
+            {
+                "zoom": zoom,
+                "cell_x": r["cell_x"],
+                "cell_y": r["cell_y"],
+                "count": r["count"],
+                "latitude": r["sum_lat"] / r["count"],
+                "longitude": r["sum_lon"] / r["count"],
+                "categories": json.loads(r["categories_json"]),
+            }
+        )
+    return out
@@ -0,0 +1,61 @@
+from typing import Any, Iterable
+
+from fastapi.responses import JSONResponse
+
+
+def encode_columnar(records: Iterable[dict]) -> dict:
+    """
+    Turn a list of same-shaped dicts into column arrays.
+
+    - Every column is a list with one entry per record (nulls kept in place).
+    - Columns that are null for every record are omitted entirely.
+    - Text columns hold indexes into a shared "strings" table, so repeated
+      values such as categories, providers or addresses are sent once.
+    """
+    records = list(records)
+    names: list[str] = []
+    for rec in records:
+        for k in rec:
+            if k not in names:
+                names.append(k)
+
+    strings: list[str] = []
+    string_index: dict[str, int] = {}
+    columns: dict[str, list[Any]] = {}
+    string_columns: list[str] = []
+
+    for name in names:
+        values = [rec.get(name) for rec in records]
+        if all(v is None for v in values):
+            continue
+        if all(v is None or isinstance(v, str) for v in values):
+            encoded = []
+            for v in values:
+                if v is None:
+                    encoded.append(None)
+                    continue
+                idx = string_index.get(v)
+                if idx is None:
+                    idx = string_index[v] = len(strings)
+                    strings.append(v)
+                encoded.append(idx)
+            columns[name] = encoded
+            string_columns.append(name)
+        else:
+            columns[name] = values
+
+    return {
+        "format": "columnar",
+        "count": len(records),
+        "strings": strings,
+        "string_columns": string_columns,
+        "columns": columns,
+    }
+
+
+def columnar_response(records: Iterable[Any]) -> JSONResponse:
+    """
+    Columnar JSON response for a list of dicts or pydantic models.
+    """
+    rows = [r.model_dump() if hasattr(r, "model_dump") else dict(r) for r in records]
+    return JSONResponse(encode_columnar(rows))
@@ -0,0 +1,90 @@
+import gzip
+from typing import Optional
+
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+
+try:
+    import brotli  # type: ignore
+except Exception:
+    brotli = None  # optional (see requirements.txt): fall back to gzip only
+
+# Bodies smaller than this are not worth the CPU or the extra headers.
+MIN_COMPRESS_BYTES = 500
+
+
+def _parse_accept_encoding(accept_encoding: str) -> dict[str, float]:
+    """
+    Map each coding in an Accept-Encoding header to its q-value (default 1).
+    Parameters other than q are ignored; a malformed q counts as 0.
+    """
+    offered: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        token, *params = part.split(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value.strip())
+                except ValueError:
+                    q = 0.0
+                break
+        offered[token] = q
+    return offered
+
+
+def _choose_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Pick the supported coding with the highest q-value; br wins ties when
+    brotli is installed. Returns None when neither br nor gzip is acceptable.
+    """
+    offered = _parse_accept_encoding(accept_encoding)
+    wildcard = offered.get("*", 0.0)
+
+    # Listed in tie-break order: on equal q the earlier one wins.
+    supported = (["br"] if brotli is not None else []) + ["gzip"]
+    best, best_q = None, 0.0
+    for enc in supported:
+        q = offered.get(enc, wildcard)
+        if q > best_q:
+            best, best_q = enc, q
+    return best
+
+
+class CompressionMiddleware(BaseHTTPMiddleware):
+    """
+    Negotiate brotli/gzip for response bodies.
+
+    Must sit outside ETagMiddleware so tags are computed on the identity body.
+    """
+
+    async def dispatch(self, request: Request, call_next):
+        response = await call_next(request)
+
+        encoding = _choose_encoding(request.headers.get("accept-encoding", ""))
+        if encoding is None or "content-encoding" in response.headers:
+            return response
+
+        body = b"".join([chunk async for chunk in response.body_iterator])
+
+        if len(body) >= MIN_COMPRESS_BYTES:
+            if encoding == "br":
+                body = brotli.compress(body, quality=5)
+            else:
+                body = gzip.compress(body, compresslevel=6)
+        else:
+            encoding = None
+
+        # Keep the raw header list so repeated headers (e.g. Set-Cookie) survive.
+        out = Response(content=body, status_code=response.status_code)
+        out.raw_headers = list(response.raw_headers)
+        out.headers.add_vary_header("Accept-Encoding")
+        if encoding is not None:
+            out.headers["content-encoding"] = encoding
+            out.headers["content-length"] = str(len(body))
+        return out
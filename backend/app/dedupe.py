@@ -0,0 +1,260 @@
+import re
+import sqlite3
+import unicodedata
+from collections import defaultdict
+from typing import Optional
+
+from .db import get_conn
+from .geo import geohash, geohash_neighbourhood, haversine_km
+
+# SQL predicate for read queries on places: hide rows resolved as duplicates.
+CANONICAL_ONLY = "id NOT IN (SELECT place_id FROM place_duplicates)"
+
+# Precision 6 cells are roughly 1.2km x 0.6km; with the 8 neighbouring cells
+# that comfortably covers the same program geocoded by two different feeds.
+GEOHASH_PRECISION = 6
+
+# Tokens shared by more places than this in one cell are too common to be a
+# useful blocking key (e.g. "food" downtown) and would reintroduce quadratic work.
+MAX_BLOCK_SIZE = 50
+
+# Two records further apart than this are never the same place.
+MAX_DISTANCE_KM = 0.3
+
+MATCH_THRESHOLD = 0.75
+
+_STOPWORDS = {
+    "a", "an", "and", "at", "by", "for", "in", "of", "on", "the", "to",
+    "inc", "ltd", "co", "kingston",
+}
+
+_ADDRESS_ABBREV = {
+    "street": "st", "avenue": "ave", "road": "rd", "drive": "dr", "boulevard": "blvd",
+    "crescent": "cres", "court": "ct", "place": "pl", "lane": "ln", "square": "sq",
+    "north": "n", "south": "s", "east": "e", "west": "w", "unit": "", "suite": "",
+}
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def fold_text(text: Optional[str]) -> str:
+    """
+    Lowercase, accent-free text with punctuation collapsed to single spaces.
+    """
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    # Drop apostrophes rather than splitting on them: "Martha's" == "Marthas".
+    text = text.replace("'", "").replace("\u2019", "")
+    return _NON_ALNUM.sub(" ", text.lower()).strip()
+
+
+def name_tokens(name: Optional[str]) -> set[str]:
+    return {t for t in fold_text(name).split() if t not in _STOPWORDS and len(t) > 1}
+
+
+def address_tokens(address: Optional[str]) -> set[str]:
+    out = set()
+    for t in fold_text(address).split():
+        t = _ADDRESS_ABBREV.get(t, t)
+        if t:
+            out.add(t)
+    return out
+
+
+def _phone_digits(phone: Optional[str]) -> str:
+    digits = re.sub(r"\D", "", phone or "")
+    return digits[-10:]
+
+
+def _jaccard(a: set, b: set) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def _score(a: dict, b: dict) -> Optional[float]:
+    """
+    Match score in [0, 1] for two prepared records, or None if they cannot match.
+    """
+    if a["source"] == b["source"]:
+        # Within one feed distinct ids are distinct programs (e.g. a meal program
+        # and a washroom at the same centre).
+        return None
+    if a["category"] != b["category"]:
+        return None
+
+    name_sim = _jaccard(a["name_tokens"], b["name_tokens"])
+    if name_sim < 0.5:
+        return None
+
+    if a["lat"] is not None and b["lat"] is not None:
+        d = haversine_km(a["lat"], a["lon"], b["lat"], b["lon"])
+        if d > MAX_DISTANCE_KM:
+            return None
+        dist_sim = 1.0 - d / MAX_DISTANCE_KM
+    else:
+        dist_sim = 0.5
+
+    addr_sim = _jaccard(a["address_tokens"], b["address_tokens"])
+    phone_sim = 1.0 if a["phone"] and a["phone"] == b["phone"] else 0.0
+
+    return 0.5 * name_sim + 0.2 * dist_sim + 0.2 * addr_sim + 0.1 * phone_sim
+
+
+def _candidate_pairs(records: list[dict]) -> set[tuple[int, int]]:
+    """
+    Blocking: records are only compared when they share a name token and sit in
+    the same or an adjacent geohash cell (or both lack coordinates).
+    """
+    blocks: dict[tuple[str, str], list[int]] = defaultdict(list)
+    for i, rec in enumerate(records):
+        for tok in rec["name_tokens"]:
+            blocks[(rec["cell"], tok)].append(i)
+
+    pairs: set[tuple[int, int]] = set()
+    for i, rec in enumerate(records):
+        for cell in rec["neighbour_cells"]:
+            for tok in rec["name_tokens"]:
+                block = blocks.get((cell, tok))
+                if not block or len(block) > MAX_BLOCK_SIZE:
+                    continue
+                for j in block:
+                    if j > i:
+                        pairs.add((i, j))
+    return pairs
+
+
+def _completeness(rec: dict) -> int:
+    return sum(1 for k in ("address", "phone_raw", "website", "hours_json", "lat") if rec[k] is not None)
+
+
+def find_duplicates(rows: list) -> dict[int, tuple[int, float]]:
+    """
+    Resolve duplicate places. Returns {duplicate_id: (canonical_id, score)};
+    canonical places themselves are not in the mapping.
+    """
+    records = []
+    for r in rows:
+        lat, lon = r["latitude"], r["longitude"]
+        has_coords = lat is not None and lon is not None
+        records.append(
+            {
+                "id": r["id"],
+                "source": r["source"],
+                "category": r["category"],
+                "name_tokens": name_tokens(r["name"]),
+                "address_tokens": address_tokens(r["address"]),
+                "address": r["address"],
+                "phone": _phone_digits(r["phone"]),
+                "phone_raw": r["phone"],
+                "website": r["website"],
+                "hours_json": r["hours_json"],
+                "last_verified": r["last_verified"] or "",
+                "lat": lat if has_coords else None,
+                "lon": lon if has_coords else None,
+                "cell": geohash(lat, lon, GEOHASH_PRECISION) if has_coords else "",
+                "neighbour_cells": geohash_neighbourhood(lat, lon, GEOHASH_PRECISION) if has_coords else {""},
+            }
+        )
+
+    parent = list(range(len(records)))
+    # Sources present in each group, keyed by root. A group never holds two
+    # records from the same feed: within a feed, distinct ids are distinct
+    # programs, so chaining A~X~B must not merge feed-mates A and B.
+    sources = [{rec["source"]} for rec in records]
+
+    def _find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    scored = []
+    for i, j in _candidate_pairs(records):
+        s = _score(records[i], records[j])
+        if s is not None and s >= MATCH_THRESHOLD:
+            scored.append((s, i, j))
+
+    # Strongest matches first, so a record joins its best partner before a
+    # weaker one can claim the slot for that source.
+    scored.sort(key=lambda t: (-t[0], t[1], t[2]))
+
+    best_score: dict[int, float] = {}
+    for s, i, j in scored:
+        ri, rj = _find(i), _find(j)
+        if ri == rj:
+            continue
+        if sources[ri] & sources[rj]:
+            continue
+        parent[rj] = ri
+        sources[ri] |= sources[rj]
+        for k in (i, j):
+            best_score[k] = max(best_score.get(k, 0.0), s)
+
+    groups: dict[int, list[int]] = defaultdict(list)
+    for i in best_score:
+        groups[_find(i)].append(i)
+
+    out: dict[int, tuple[int, float]] = {}
+    for members in groups.values():
+        # Most recently verified wins, then the most complete record, then the oldest id.
+        canonical = max(
+            members,
+            key=lambda k: (records[k]["last_verified"], _completeness(records[k]), -records[k]["id"]),
+        )
+        for k in members:
+            if k != canonical:
+                out[records[k]["id"]] = (records[canonical]["id"], round(best_score[k], 3))
+    return out
+
+
+def resolve_duplicates(conn: Optional[sqlite3.Connection] = None) -> int:
+    """
+    Recompute place_duplicates from places, writing only rows that changed so the
+    delta-sync change log is not churned. Returns the number of duplicates.
+    """
+    own_conn = conn is None
+    if own_conn:
+        conn = get_conn()
+
+    try:
+        rows = conn.execute(
+            """
+            SELECT id, source, name, category, address, latitude, longitude, phone, website,
+                   hours_json, last_verified
+            FROM places
+            """
+        ).fetchall()
+        found = find_duplicates(rows)
+
+        existing = {
+            r["place_id"]: (r["canonical_id"], r["score"])
+            for r in conn.execute("SELECT place_id, canonical_id, score FROM place_duplicates").fetchall()
+        }
+
+        stale = [(pid,) for pid in existing if pid not in found]
+        if stale:
+            conn.executemany("DELETE FROM place_duplicates WHERE place_id = ?", stale)
+
+        for pid, (canonical_id, score) in found.items():
+            prev = existing.get(pid)
+            if prev is not None and prev[0] == canonical_id:
+                continue
+            conn.execute(
+                """
+                INSERT INTO place_duplicates(place_id, canonical_id, score) VALUES (?, ?, ?)
+                ON CONFLICT(place_id) DO UPDATE SET
+                  canonical_id=excluded.canonical_id,
+                  score=excluded.score,
+                  resolved_at=datetime('now')
+                """,
+                (pid, canonical_id, score),
+            )
+
+        conn.commit()
+        return len(found)
+    finally:
+        if own_conn:
+            conn.close()
@@ -0,0 +1,56 @@
+import hashlib
+
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+
+
+def _etag_for(body: bytes) -> str:
+    # Weak: the same value is valid for any content-encoding of the body.
+    return 'W/"%s"' % hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    """
+    If-None-Match uses weak comparison, so W/ prefixes are ignored.
+    """
+    if if_none_match.strip() == "*":
+        return True
+    target = etag[2:] if etag.startswith("W/") else etag
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == target:
+            return True
+    return False
+
+
+class ETagMiddleware(BaseHTTPMiddleware):
+    """
+    Add an ETag to successful GET responses and answer If-None-Match with 304.
+
+    The tag is a hash of the response body, so it is correct for every read
+    endpoint without each one having to know what its output depends on. The
+    handler still runs; what the client saves is the download.
+    """
+
+    async def dispatch(self, request: Request, call_next):
+        response = await call_next(request)
+        if request.method not in ("GET", "HEAD") or response.status_code != 200:
+            return response
+
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        etag = _etag_for(body)
+
+        # Work on the raw header list so repeated headers (e.g. Set-Cookie) survive.
+        inm = request.headers.get("if-none-match")
+        if inm and _matches(inm, etag):
+            out = Response(status_code=304)
+            drop = (b"etag", b"content-length", b"content-type")
+        else:
+            out = Response(content=body, status_code=response.status_code)
+            drop = (b"etag",)
+        out.raw_headers = [(k, v) for k, v in response.raw_headers if k.lower() not in drop]
+        out.headers["etag"] = etag
+        return out
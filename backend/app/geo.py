@@ -21,3 +21,55 @@ def bbox(lat: float, lon: float, radius_km: float) -> Tuple[float, float, float,
     dlat = radius_km / 111.0
     dlon = radius_km / (111.0 * math.cos(math.radians(lat)) + 1e-9)
     return (lat - dlat, lat + dlat, lon - dlon, lon + dlon)
+
+_GEOHASH_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+def geohash(lat: float, lon: float, precision: int = 6) -> str:
+    """
+    Standard base32 geohash of a point.
+    """
+    lat_lo, lat_hi = -90.0, 90.0
+    lon_lo, lon_hi = -180.0, 180.0
+    out = []
+    bits = 0
+    ch = 0
+    even = True
+    while len(out) < precision:
+        if even:
+            mid = (lon_lo + lon_hi) / 2
+            if lon >= mid:
+                ch = (ch << 1) | 1
+                lon_lo = mid
+            else:
+                ch <<= 1
+                lon_hi = mid
+        else:
+            mid = (lat_lo + lat_hi) / 2
+            if lat >= mid:
+                ch = (ch << 1) | 1
+                lat_lo = mid
+            else:
+                ch <<= 1
+                lat_hi = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            out.append(_GEOHASH_BASE32[ch])
+            bits = 0
+            ch = 0
+    return "".join(out)
+
+def geohash_neighbourhood(lat: float, lon: float, precision: int = 6) -> set[str]:
+    """
+    The geohash cell containing the point plus its 8 surrounding cells.
+    """
+    n_bits = 5 * precision
+    dlat = 180.0 / (1 << (n_bits // 2))
+    dlon = 360.0 / (1 << ((n_bits + 1) // 2))
+    cells = set()
+    for i in (-1, 0, 1):
+        for j in (-1, 0, 1):
+            la = max(-90.0, min(90.0 - 1e-9, lat + i * dlat))
+            lo = (lon + j * dlon + 180.0) % 360.0 - 180.0
+            cells.add(geohash(la, lo, precision))
+    return cells
@@ -0,0 +1,154 @@
+import re
+from functools import lru_cache
+from typing import Optional
+
+# Parse the free-text HOURS strings from the city feed ("Mon - Fri: 9 – 11am +
+# 12pm – 2pm", "7 days per week, 24 hours", "Daily: 9pm - 8am", ...) into
+# PlaceHours-style periods. Anything the parser does not understand yields None
+# ("unknown") rather than a guess.
+
+# Google-style day index: 0=Sunday.
+_DAY_INDEX = {
+    "sun": 0, "sunday": 0, "sundays": 0,
+    "mon": 1, "monday": 1, "mondays": 1,
+    "tue": 2, "tues": 2, "tuesday": 2, "tuesdays": 2,
+    "wed": 3, "wednesday": 3, "wednesdays": 3,
+    "thu": 4, "thur": 4, "thurs": 4, "thursday": 4, "thursdays": 4,
+    "fri": 5, "friday": 5, "fridays": 5,
+    "sat": 6, "saturday": 6, "saturdays": 6,
+}
+
+_DAY = r"(?:%s)" % "|".join(sorted(_DAY_INDEX, key=len, reverse=True))
+_DAY_RANGE = rf"{_DAY}(?:\s*(?:-|to)\s*{_DAY})?"
+_DAY_SPEC = rf"\b{_DAY_RANGE}\b(?:\s*(?:,|&|and)\s*\b{_DAY_RANGE}\b)*"
+_EVERY_DAY = r"\b(?:daily|every\s*day|7\s+days(?:\s+(?:per|a))?(?:\s+week)?)\b"
+_TIME = r"(\d{1,2})(?::(\d{2}))?\s*(am|pm)?"
+
+_TOKENS = re.compile(
+    rf"(?P<every>{_EVERY_DAY})"
+    rf"|(?P<days>{_DAY_SPEC})"
+    rf"|(?P<allday>\b24\s*hours\b)"
+    rf"|(?P<range>\b{_TIME}\s*(?:-|to)\s*{_TIME}\b)"
+)
+
+_MONTHS = (
+    "january|february|march|april|may|june|july|august|september|october|november|december"
+)
+_DATE = re.compile(rf"\b(?:{_MONTHS})\s+\d{{1,2}}(?:\s*,\s*\d{{4}})?")
+
+_MINUTES_PER_DAY = 24 * 60
+
+
+def _normalize(text: str) -> str:
+    s = text.lower().replace("–", "-").replace("—", "-").replace('"', " ")
+    s = s.replace("'s", "s")
+    s = re.sub(r"\([^)]*\)", " ", s)  # "(closed noon - 1 p.m.)", "(excluding holidays)"
+    s = _DATE.sub(" ", s)  # seasonal date ranges
+    s = re.sub(r"(\d)\s*([ap])\.?\s?m\b\.?", r"\1\2m", s)  # "8 a.m." -> "8am"
+    s = re.sub(r"\bnoon\b", "12pm", s)
+    return s
+
+
+def _expand_days(spec: str) -> list[int]:
+    days: list[int] = []
+    for part in re.split(r"\s*(?:,|&|\band\b)\s*", spec):
+        names = re.findall(_DAY, part)
+        if not names:
+            continue
+        start = _DAY_INDEX[names[0]]
+        end = _DAY_INDEX[names[-1]]
+        d = start
+        while True:
+            if d not in days:
+                days.append(d)
+            if d == end:
+                break
+            d = (d + 1) % 7
+    return days
+
+
+def _to_minutes(hour: str, minute: Optional[str], meridiem: Optional[str]) -> Optional[int]:
+    h = int(hour)
+    m = int(minute or 0)
+    if h > 23 or m > 59:
+        return None
+    if meridiem == "am" and h == 12:
+        h = 0
+    elif meridiem == "pm" and h < 12:
+        h += 12
+    return h * 60 + m
+
+
+def _parse_range(m: re.Match) -> Optional[tuple[int, int]]:
+    h1, m1, ap1, h2, m2, ap2 = m.group(5, 6, 7, 8, 9, 10)
+    if ap1 is None and ap2 is None:
+        return None  # bare numbers are too ambiguous (could be dates, unit numbers)
+    end = _to_minutes(h2, m2, ap2)
+    if end is None:
+        return None
+    if ap1 is None:
+        # "9 - 11am": borrow the end's meridiem unless that would put the start
+        # after the end ("10 - 2pm" is 10am).
+        start = _to_minutes(h1, m1, ap2)
+        if start is not None and start > end:
+            start = _to_minutes(h1, m1, "am" if ap2 == "pm" else "pm")
+    else:
+        start = _to_minutes(h1, m1, ap1)
+    if start is None:
+        return None
+    return start, end
+
+
+def _period(day: int, start: int, end: int) -> dict:
+    """
+    A PlaceHours period; ranges ending at or before their start close the next day.
+    """
+    close_day = day if end > start else (day + 1) % 7
+    return {
+        "open": {"day": day, "hour": start // 60, "minute": start % 60},
+        "close": {"day": close_day, "hour": end // 60, "minute": end % 60},
+    }
+
+
+@lru_cache(maxsize=1024)
+def _parse(text: str) -> Optional[tuple]:
+    s = _normalize(text)
+    days: list[int] = []
+    periods: list[dict] = []
+    last_was_time = False
+
+    for tok in _TOKENS.finditer(s):
+        kind = tok.lastgroup
+        if kind in ("every", "days"):
+            new_days = list(range(7)) if kind == "every" else _expand_days(tok.group(0))
+            # A day spec right after a day spec ("Sat & Sun") extends it;
+            # after a time it starts a new group ("... 5pm Sat 10am-6pm").
+            days = new_days if last_was_time or not days else days + new_days
+            last_was_time = False
+        elif kind == "allday":
+            if not days:
+                return None
+            if len(days) == 7:
+                # Google convention: a lone open period without a close means 24/7.
+                return ({"open": {"day": 0, "hour": 0, "minute": 0}},)
+            periods.extend(_period(d, 0, 0) for d in days)
+            last_was_time = True
+        else:
+            rng = _parse_range(tok)
+            if rng is None or not days:
+                return None
+            periods.extend(_period(d, *rng) for d in days)
+            last_was_time = True
+
+    return tuple(periods) if periods else None
+
+
+def periods_from_raw_hours(raw_hours: Optional[str]) -> Optional[list[dict]]:
+    """
+    PlaceHours-style periods parsed from a free-text hours string, or None when
+    the text is missing or not understood.
+    """
+    if not raw_hours or not raw_hours.strip():
+        return None
+    parsed = _parse(raw_hours.strip())
+    return list(parsed) if parsed is not None else None
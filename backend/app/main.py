@@ -11,11 +11,17 @@ from .settings import (
 )
 from .schema import init_db
 from .db import get_conn
+from .clusters import rebuild_clusters
+from .dedupe import resolve_duplicates
+from .compression import CompressionMiddleware
+from .etag import ETagMiddleware
+from .suggest import suggest_index
 
 from .api.location import router as location_router
 from .api.search import router as search_router
 from .api.pickups import router as pickups_router
 from .api.backboard import router as backboard_router
+from .api.places import router as places_router
 
 # Import the ingest function from your script
 from .scripts.inject_geojson import ingest as ingest_geojson
@@ -31,12 +37,27 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
+app.add_middleware(ETagMiddleware)
+# Added last so it wraps ETagMiddleware and tags hash the uncompressed body.
+app.add_middleware(CompressionMiddleware)
 
 @app.on_event("startup")
 def _startup():
     init_db()
+    _auto_ingest()
 
+    # Cheap relative to ingest, and keeps derived tables valid for databases that
+    # were populated before they existed.
+    duplicates = resolve_duplicates()
+    logger.info(f"Duplicate resolution done: {duplicates} duplicates hidden.")
+    cells = rebuild_clusters()
+    logger.info(f"Cluster pyramid ready: {cells} cells.")
+    suggest_index.ensure_fresh(force=True)
+    logger.info("Suggest index ready.")
+
+def _auto_ingest():
     if not AUTO_INGEST_ENABLED:
         logger.info("Auto-ingest disabled (AUTO_INGEST_ENABLED=0).")
         return
@@ -64,6 +85,7 @@ app.include_router(location_router)
 app.include_router(search_router)
 app.include_router(pickups_router)
 app.include_router(backboard_router)
+app.include_router(places_router)
 
 @app.get("/health")
 def health():
@@ -1,5 +1,8 @@
-from pydantic import BaseModel
-from typing import Optional, List
+import json
+from pydantic import BaseModel, Field
+from typing import Any, Optional, List, Dict
+
+from .ranking import SORT_PATTERN
 
 # NOTE: Day indexing is Google style: 0=Sunday, 6=Saturday
 class PlaceHoursPeriodTime(BaseModel):
@@ -29,3 +32,60 @@ class Place(BaseModel):
     website: Optional[str] = None
     hours: Optional[PlaceHours] = None
     last_verified: Optional[str] = None
+
+def place_from_row(r: Any) -> Place:
+    """
+    Build a Place from a places row selected with the standard Place columns.
+    """
+    hours = json.loads(r["hours_json"]) if r["hours_json"] else None
+    return Place(
+        id=r["id"],
+        name=r["name"],
+        category=r["category"],
+        address=r["address"],
+        latitude=r["latitude"],
+        longitude=r["longitude"],
+        phone=r["phone"],
+        website=r["website"],
+        hours=hours,
+        last_verified=r["last_verified"],
+    )
+
+class Cluster(BaseModel):
+    zoom: int
+    cell_x: int
+    cell_y: int
+    count: int
+    latitude: float
+    longitude: float
+    categories: Dict[str, int]
+
+class NearbyOrigin(BaseModel):
+    latitude: float
+    longitude: float
+
+class NearbyBatchRequest(BaseModel):
+    origins: List[NearbyOrigin] = Field(..., min_length=1, max_length=100)
+    radius_km: float = Field(3.0, ge=0.1)
+    limit: int = Field(50, ge=1, le=200)
+    category: Optional[str] = Field(None, description="Optional category filter")
+    sort: str = Field("distance", pattern=SORT_PATTERN, description="distance (default) or relevance")
+    prefer_category: Optional[str] = Field(None, description="Category to boost when sort=relevance")
+
+class NearbyHit(BaseModel):
+    id: int
+    distance_km: float
+
+class NearbyBatchResponse(BaseModel):
+    # Each place is serialized once here; results reference it by id.
+    places: Dict[int, Place]
+    results: List[List[NearbyHit]]
+
+class Suggestion(BaseModel):
+    text: str
+    field: str  # name | provider | raw_type | address
+    place_id: int
+    name: str
+    category: str
+    distance_km: Optional[float] = None
+    score: float
@@ -0,0 +1,141 @@
+import heapq
+import json
+from datetime import datetime, timezone
+from typing import Any, Optional
+from zoneinfo import ZoneInfo
+
+from .hours import periods_from_raw_hours
+from .settings import (
+    PLACES_TIMEZONE,
+    RANK_FRESHNESS_HALF_LIFE_DAYS,
+    RANK_WEIGHT_CATEGORY,
+    RANK_WEIGHT_DISTANCE,
+    RANK_WEIGHT_FRESHNESS,
+    RANK_WEIGHT_OPEN,
+    RANK_WEIGHT_WINTER,
+)
+
+# "distance": closest first (the original behaviour).
+# "relevance": weighted score over distance, open now, category, freshness, winter response.
+SORT_OPTIONS = ("distance", "relevance")
+SORT_PATTERN = "^(" + "|".join(SORT_OPTIONS) + ")$"
+
+WINTER_MONTHS = (11, 12, 1, 2, 3)
+
+_MINUTES_PER_WEEK = 7 * 24 * 60
+
+
+def _local_now() -> datetime:
+    try:
+        return datetime.now(ZoneInfo(PLACES_TIMEZONE))
+    except Exception:
+        return datetime.now().astimezone()
+
+
+def _parse_iso(dt_str: str) -> Optional[datetime]:
+    s = dt_str.strip()
+    if s.endswith("Z"):
+        s = s[:-1] + "+00:00"
+    try:
+        dt = datetime.fromisoformat(s)
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt
+
+
+def _week_minute(day: int, hour: int, minute: int) -> int:
+    return day * 24 * 60 + hour * 60 + minute
+
+
+def is_open(hours_json: Optional[str], now: datetime, raw_hours: Optional[str] = None) -> Optional[bool]:
+    """
+    Whether a place is open at `now`. Uses the PlaceHours JSON when present and
+    otherwise the periods parsed from the feed's free-text hours.
+    Returns None when the hours are unknown.
+    """
+    periods = None
+    if hours_json:
+        try:
+            hours = json.loads(hours_json)
+        except ValueError:
+            hours = {}
+        periods = hours.get("periods") or None
+        if periods is None and hours.get("openNow") is not None:
+            return bool(hours["openNow"])
+
+    if periods is None:
+        periods = periods_from_raw_hours(raw_hours)
+    if periods is None:
+        return None
+
+    # Google-style day index: 0=Sunday.
+    current = _week_minute(now.isoweekday() % 7, now.hour, now.minute)
+    for p in periods:
+        o = p.get("open") or {}
+        c = p.get("close")
+        if c is None:
+            # An open period without a close time means open around the clock.
+            return True
+        start = _week_minute(o.get("day", 0), o.get("hour", 0), o.get("minute", 0))
+        end = _week_minute(c.get("day", 0), c.get("hour", 0), c.get("minute", 0))
+        if end <= start:
+            end += _MINUTES_PER_WEEK
+        if start <= current < end or start <= current + _MINUTES_PER_WEEK < end:
+            return True
+    return False
+
+
+def score(
+    distance_km: float,
+    row: Any,
+    radius_km: float,
+    now: datetime,
+    prefer_category: Optional[str] = None,
+) -> float:
+    """
+    Weighted relevance of one candidate; every component is scaled to [0, 1].
+    `row` needs category, hours_json, raw_hours, last_verified and winter_response.
+    """
+    total = RANK_WEIGHT_DISTANCE * max(0.0, 1.0 - distance_km / radius_km)
+
+    open_now = is_open(row["hours_json"], now, row["raw_hours"])
+    total += RANK_WEIGHT_OPEN * (0.5 if open_now is None else float(open_now))
+
+    if prefer_category and row["category"] == prefer_category:
+        total += RANK_WEIGHT_CATEGORY
+
+    verified = _parse_iso(row["last_verified"]) if row["last_verified"] else None
+    if verified is not None:
+        age_days = max(0.0, (now - verified).total_seconds() / 86400.0)
+        total += RANK_WEIGHT_FRESHNESS * 0.5 ** (age_days / RANK_FRESHNESS_HALF_LIFE_DAYS)
+
+    if row["winter_response"] and now.month in WINTER_MONTHS:
+        total += RANK_WEIGHT_WINTER
+
+    return total
+
+
+def top_k(
+    candidates: list[tuple[float, Any]],
+    k: int,
+    sort: str = "distance",
+    radius_km: float = 1.0,
+    prefer_category: Optional[str] = None,
+) -> list[tuple[float, Any]]:
+    """
+    Best k (distance_km, row) candidates, best first.
+
+    Uses a bounded heap (heapq.nsmallest/nlargest) so the cost is O(n log k)
+    rather than sorting every in-radius candidate.
+    """
+    if sort == "distance":
+        return heapq.nsmallest(k, candidates, key=lambda c: c[0])
+
+    now = _local_now()
+    return heapq.nlargest(
+        k,
+        candidates,
+        key=lambda c: (score(c[0], c[1], radius_km, now, prefer_category), -c[0]),
+    )
@@ -47,10 +47,91 @@ CREATE TABLE IF NOT EXISTS pickups (
 
 CREATE INDEX IF NOT EXISTS idx_pickups_end ON pickups(window_end);
 CREATE INDEX IF NOT EXISTS idx_pickups_latlon ON pickups(latitude, longitude);
+
+-- Precomputed marker clusters (see app/clusters.py); rebuilt on ingest.
+CREATE TABLE IF NOT EXISTS place_clusters (
+  zoom            INTEGER NOT NULL,
+  cell_x          INTEGER NOT NULL,
+  cell_y          INTEGER NOT NULL,
+  count           INTEGER NOT NULL,
+  sum_lat         REAL NOT NULL,
+  sum_lon         REAL NOT NULL,
+  categories_json TEXT NOT NULL, -- JSON object: category -> count
+  PRIMARY KEY(zoom, cell_x, cell_y)
+);
+
+-- Append-only change log for delta sync; seq is the client cursor.
+CREATE TABLE IF NOT EXISTS place_changes (
+  seq        INTEGER PRIMARY KEY AUTOINCREMENT,
+  place_id   INTEGER NOT NULL,
+  changed_at TEXT NOT NULL DEFAULT (datetime('now'))
+);
+
+CREATE INDEX IF NOT EXISTS idx_place_changes_place ON place_changes(place_id);
+
+-- One row: a random id for this database's change history. Cursors carry it so
+-- a client holding a cursor from a different (e.g. rebuilt) database is reset.
+CREATE TABLE IF NOT EXISTS sync_state (
+  id    INTEGER PRIMARY KEY CHECK (id = 1),
+  epoch TEXT NOT NULL
+);
+
+INSERT OR IGNORE INTO sync_state(id, epoch) VALUES (1, lower(hex(randomblob(8))));
+
+CREATE TRIGGER IF NOT EXISTS trg_places_insert AFTER INSERT ON places
+BEGIN
+  INSERT INTO place_changes(place_id) VALUES (NEW.id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_places_update AFTER UPDATE ON places
+BEGIN
+  INSERT INTO place_changes(place_id) VALUES (NEW.id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_places_delete AFTER DELETE ON places
+BEGIN
+  INSERT INTO place_changes(place_id) VALUES (OLD.id);
+END;
+
+-- Cross-source duplicates found by app/dedupe.py; read endpoints hide place_id.
+CREATE TABLE IF NOT EXISTS place_duplicates (
+  place_id     INTEGER PRIMARY KEY,
+  canonical_id INTEGER NOT NULL,
+  score        REAL NOT NULL,
+  resolved_at  TEXT NOT NULL DEFAULT (datetime('now'))
+);
+
+CREATE INDEX IF NOT EXISTS idx_place_duplicates_canonical ON place_duplicates(canonical_id);
+
+-- A place becoming (or ceasing to be) a duplicate is a change for sync clients.
+CREATE TRIGGER IF NOT EXISTS trg_place_duplicates_insert AFTER INSERT ON place_duplicates
+BEGIN
+  INSERT INTO place_changes(place_id) VALUES (NEW.place_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_place_duplicates_update AFTER UPDATE ON place_duplicates
+BEGIN
+  INSERT INTO place_changes(place_id) VALUES (NEW.place_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_place_duplicates_delete AFTER DELETE ON place_duplicates
+BEGIN
+  INSERT INTO place_changes(place_id) VALUES (OLD.place_id);
+END;
 """
 
 def init_db() -> None:
     conn = get_conn()
     conn.executescript(SCHEMA_SQL)
+    # Databases populated before the change log existed: seed it so the first
+    # delta sync has a non-zero cursor to hand out.
+    conn.execute(
+        """
+        INSERT INTO place_changes(place_id)
+        SELECT id FROM places
+        WHERE NOT EXISTS (SELECT 1 FROM place_changes)
+        ORDER BY id
+        """
+    )
     conn.commit()
     conn.close()
@@ -0,0 +1,121 @@
+import argparse
+import sys
+from collections import defaultdict
+
+from ..db import get_conn
+from ..dedupe import find_duplicates
+
+# Offset for synthetic second-source ids so they never collide with real ones.
+_COPY_ID_OFFSET = 1_000_000
+
+_FIELDS = (
+    "id", "source", "name", "category", "address", "latitude", "longitude",
+    "phone", "website", "hours_json", "last_verified",
+)
+
+
+def _row(**kw) -> dict:
+    row = {f: None for f in _FIELDS}
+    row.update(kw)
+    return row
+
+
+def _multi_program_fixture() -> list[dict]:
+    """
+    One centre running several programs (same name, address and feed, different
+    categories), mirrored by a second feed. Each program must only collapse onto
+    its own counterpart.
+    """
+    rows = []
+    for n, category in enumerate(("washroom", "meals", "dropin", "other")):
+        for source, id_base, lat in (("feed1", 1, 44.23100), ("feed2", 101, 44.23102)):
+            rows.append(
+                _row(
+                    id=id_base + n,
+                    source=source,
+                    name="St. Mary's Drop-In Centre",
+                    category=category,
+                    address="260 Brock St.",
+                    latitude=lat,
+                    longitude=-76.48500,
+                    phone="613-555-0100",
+                )
+            )
+    return rows
+
+
+def _perturbed_copy(rows: list[dict], source: str) -> list[dict]:
+    """
+    A second-source copy of every row with small name, address and position changes.
+    """
+    out = []
+    for r in rows:
+        copy = dict(r)
+        copy["id"] = r["id"] + _COPY_ID_OFFSET
+        copy["source"] = source
+        copy["name"] = (r["name"] or "").upper().replace("'", "")
+        copy["address"] = (r["address"] or "").replace("St.", "Street").replace(" St", " Street")
+        if r["latitude"] is not None:
+            copy["latitude"] = r["latitude"] + 0.0001
+            copy["longitude"] = r["longitude"] - 0.0001
+        out.append(copy)
+    return out
+
+
+def check(rows: list[dict]) -> list[str]:
+    """
+    Run duplicate resolution over `rows` and return a list of invariant violations.
+    """
+    by_id = {r["id"]: r for r in rows}
+    found = find_duplicates(rows)
+    problems = []
+
+    groups: dict[int, list[int]] = defaultdict(list)
+    for dup_id, (canonical_id, _) in found.items():
+        groups[canonical_id].append(dup_id)
+        if by_id[dup_id]["category"] != by_id[canonical_id]["category"]:
+            problems.append(f"id {dup_id} ({by_id[dup_id]['category']}) merged into "
+                            f"id {canonical_id} ({by_id[canonical_id]['category']})")
+
+    for canonical_id, dups in groups.items():
+        members = [canonical_id] + dups
+        sources = [by_id[m]["source"] for m in members]
+        if len(sources) != len(set(sources)):
+            problems.append(f"group {sorted(members)} has several records from one source: {sources}")
+
+    n_sources = len({r["source"] for r in rows})
+    max_hidden = len(rows) - len(rows) // n_sources
+    if len(found) > max_hidden:
+        problems.append(f"hid {len(found)} rows, more than the {max_hidden} possible duplicates")
+
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sanity-check duplicate resolution invariants")
+    parser.add_argument("--skip-db", action="store_true", help="Only run the built-in fixture")
+    args = parser.parse_args()
+
+    cases = [("multi-program fixture", _multi_program_fixture())]
+
+    if not args.skip_db:
+        conn = get_conn()
+        rows = [dict(r) for r in conn.execute(f"SELECT {', '.join(_FIELDS)} FROM places").fetchall()]
+        conn.close()
+        cases.append(("places + perturbed second source", rows + _perturbed_copy(rows, "check_copy")))
+
+    failed = False
+    for label, rows in cases:
+        problems = check(rows)
+        hidden = len(find_duplicates(rows))
+        status = "FAIL" if problems else "ok"
+        print(f"[{status}] {label}: rows={len(rows)} hidden={hidden}")
+        for p in problems:
+            print(f"    {p}")
+        failed = failed or bool(problems)
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
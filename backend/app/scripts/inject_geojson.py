@@ -7,6 +7,8 @@ from typing import Any, Optional
 from ..schema import init_db
 from ..db import get_conn
 from ..category import map_type_to_category
+from ..clusters import rebuild_clusters
+from ..dedupe import resolve_duplicates
 
 
 def ms_to_iso(ms: Optional[int]) -> Optional[str]:
@@ -42,6 +44,7 @@ def ingest(source: str, path: Path) -> None:
     conn = get_conn()
     inserted = 0
     updated = 0
+    unchanged = 0
     skipped = 0
 
     for ft in features:
@@ -80,7 +83,7 @@ def ingest(source: str, path: Path) -> None:
                 (source, external_objectid),
             ).fetchone() is not None
 
-            conn.execute(
+            cur = conn.execute(
                 """
                 INSERT INTO places(
                   source, external_objectid, name, provider, raw_type, category,
@@ -104,6 +107,22 @@ def ingest(source: str, path: Path) -> None:
                   show_on_public_app=excluded.show_on_public_app,
                   winter_response=excluded.winter_response,
                   updated_at=datetime('now')
+                -- Leave unchanged rows alone so updated_at and the change log
+                -- only move when the feed actually changed.
+                WHERE places.name IS NOT excluded.name
+                   OR places.provider IS NOT excluded.provider
+                   OR places.raw_type IS NOT excluded.raw_type
+                   OR places.category IS NOT excluded.category
+                   OR places.description IS NOT excluded.description
+                   OR places.address IS NOT excluded.address
+                   OR places.latitude IS NOT excluded.latitude
+                   OR places.longitude IS NOT excluded.longitude
+                   OR places.phone IS NOT excluded.phone
+                   OR places.website IS NOT excluded.website
+                   OR places.raw_hours IS NOT excluded.raw_hours
+                   OR places.last_verified IS NOT excluded.last_verified
+                   OR places.show_on_public_app IS NOT excluded.show_on_public_app
+                   OR places.winter_response IS NOT excluded.winter_response
                 """,
                 (
                     source,
@@ -126,7 +145,9 @@ def ingest(source: str, path: Path) -> None:
                 ),
             )
 
-            if existed_before:
+            if existed_before and cur.rowcount == 0:
+                unchanged += 1
+            elif existed_before:
                 updated += 1
             else:
                 inserted += 1
@@ -138,9 +159,14 @@ def ingest(source: str, path: Path) -> None:
     conn.commit()
 
     total = conn.execute("SELECT COUNT(*) FROM places").fetchone()[0]
+    duplicates = resolve_duplicates(conn)
+    cells = rebuild_clusters(conn)
     conn.close()
 
-    print(f"Done. places_total={total} inserted={inserted} updated={updated} skipped={skipped}")
+    print(f"Resolved duplicates: duplicates={duplicates}")
+    print(f"Rebuilt cluster pyramid: cells={cells}")
+
+    print(f"Done. places_total={total} inserted={inserted} updated={updated} unchanged={unchanged} skipped={skipped}")
 
 
 def main():
@@ -42,3 +42,21 @@ BACKBOARD_API_URL = os.getenv("BACKBOARD_API_URL", "https://app.backboard.io/api
 BACKBOARD_MODEL = os.getenv("BACKBOARD_MODEL", "gpt-4o").strip()
 BACKBOARD_MEMORY_ENABLED = os.getenv("BACKBOARD_MEMORY_ENABLED", "1").strip() in ("1", "true", "yes", "y")
 BACKBOARD_MEMORY_MAX_TOKENS = int(os.getenv("BACKBOARD_MEMORY_MAX_TOKENS", "1000"))
+
+# --- Ranking (sort=relevance on nearby endpoints) ---
+# RANK_WEIGHT_OPEN uses hours_json when present, otherwise the feed's free-text
+# HOURS (raw_hours) parsed by app/hours.py; unparseable hours score as unknown.
+RANK_WEIGHT_DISTANCE = float(os.getenv("RANK_WEIGHT_DISTANCE", "1.0"))
+RANK_WEIGHT_OPEN = float(os.getenv("RANK_WEIGHT_OPEN", "0.6"))
+RANK_WEIGHT_CATEGORY = float(os.getenv("RANK_WEIGHT_CATEGORY", "0.5"))
+RANK_WEIGHT_FRESHNESS = float(os.getenv("RANK_WEIGHT_FRESHNESS", "0.3"))
+RANK_WEIGHT_WINTER = float(os.getenv("RANK_WEIGHT_WINTER", "0.3"))
+RANK_FRESHNESS_HALF_LIFE_DAYS = float(os.getenv("RANK_FRESHNESS_HALF_LIFE_DAYS", "180"))
+# Opening hours are stored as local wall-clock times.
+PLACES_TIMEZONE = os.getenv("PLACES_TIMEZONE", "America/Toronto").strip()
+
+# --- Backboard load control ---
+BACKBOARD_MAX_CONCURRENCY = int(os.getenv("BACKBOARD_MAX_CONCURRENCY", "4"))
+BACKBOARD_MAX_QUEUE = int(os.getenv("BACKBOARD_MAX_QUEUE", "16"))
+BACKBOARD_QUEUE_TIMEOUT_S = float(os.getenv("BACKBOARD_QUEUE_TIMEOUT_S", "10"))
+BACKBOARD_RETRY_AFTER_S = int(os.getenv("BACKBOARD_RETRY_AFTER_S", "5"))
@@ -0,0 +1,88 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable
+
+
+class Overloaded(Exception):
+    """
+    Raised when the wait queue is full or a queued caller waited too long.
+    """
+
+
+class ConcurrencyLimiter:
+    """
+    At most `max_concurrency` callers run at once; up to `max_queue` more may
+    wait (for at most `queue_timeout` seconds). Anyone beyond that is rejected
+    immediately with Overloaded instead of piling up on the worker.
+    """
+
+    def __init__(self, max_concurrency: int, max_queue: int, queue_timeout: float):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._sem = asyncio.Semaphore(max_concurrency)
+        self.in_flight = 0
+        self.queued = 0
+        self.shed_total = 0
+
+    @asynccontextmanager
+    async def slot(self):
+        if not self._sem.locked():
+            # A free slot is taken without yielding, so the counters below
+            # cannot be raced by callers arriving in the same loop iteration.
+            await self._sem.acquire()
+        elif self.queued >= self.max_queue:
+            self.shed_total += 1
+            raise Overloaded("queue full")
+        else:
+            self.queued += 1
+            try:
+                await asyncio.wait_for(self._sem.acquire(), timeout=self.queue_timeout)
+            except asyncio.TimeoutError:
+                self.shed_total += 1
+                raise Overloaded("timed out waiting for a slot")
+            finally:
+                self.queued -= 1
+
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._sem.release()
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls with the same key onto one execution.
+
+    The first caller for a key starts the work as a task; callers arriving
+    while it runs await the same task and get the same result or exception.
+    Waiters are shielded, so one client disconnecting does not cancel the
+    call for everyone else.
+    """
+
+    def __init__(self):
+        self._calls: dict[str, asyncio.Task] = {}
+        self.coalesced_total = 0
+
+    @property
+    def keys_in_flight(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+        else:
+            self.coalesced_total += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Mark the exception retrieved in case every waiter went away.
+        if not task.cancelled():
+            task.exception()
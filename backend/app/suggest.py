@@ -0,0 +1,168 @@
+import threading
+import time
+from bisect import bisect_left
+from typing import Optional
+
+from .db import get_conn
+from .dedupe import CANONICAL_ONLY, fold_text
+from .geo import haversine_km
+
+# Searchable fields and how much a match in each is worth.
+FIELD_WEIGHTS = {
+    "name": 1.0,
+    "provider": 0.8,
+    "raw_type": 0.6,
+    "address": 0.5,
+}
+
+# Extra credit when the prefix matches the start of the field, not a later word.
+FIELD_START_BONUS = 0.3
+
+# Up to this much is added for places near the caller, halving every PROXIMITY_SCALE_KM.
+PROXIMITY_WEIGHT = 0.5
+PROXIMITY_SCALE_KM = 2.0
+
+# Bound the work per keystroke for very short, very common prefixes.
+MAX_SCAN = 5000
+
+# How often a lookup may check the change log for new data; in between,
+# lookups are served from memory without touching the database.
+FRESHNESS_CHECK_INTERVAL_S = 5.0
+
+
+class SuggestIndex:
+    """
+    Sorted-array prefix index over place text fields.
+
+    Every word position in a field contributes one key (the folded text from
+    that word to the end of the field), so "tab" finds "Martha's Table" and
+    "marthas ta" finds it too. A lookup is a bisect plus a scan over the
+    matching run; the database is only consulted by ensure_fresh(), at most
+    once every FRESHNESS_CHECK_INTERVAL_S.
+    """
+
+    def __init__(self):
+        self.version = -1
+        # (keys, postings, places), published as one tuple so readers always see
+        # arrays from the same build. postings: (place index, field, at field start).
+        self._index: tuple[list[str], list[tuple[int, str, bool]], list[dict]] = ([], [], [])
+        self._lock = threading.Lock()
+        self._checked_at = float("-inf")
+
+    def build(self, conn) -> None:
+        version = _data_version(conn)
+        rows = conn.execute(
+            f"""
+            SELECT id, name, provider, raw_type, address, category, latitude, longitude
+            FROM places
+            WHERE {CANONICAL_ONLY}
+            """
+        ).fetchall()
+
+        places = []
+        entries = []
+        for r in rows:
+            idx = len(places)
+            places.append(dict(r))
+            for field in FIELD_WEIGHTS:
+                words = fold_text(r[field]).split()
+                for start in range(len(words)):
+                    entries.append((" ".join(words[start:]), idx, field, start == 0))
+
+        entries.sort(key=lambda e: e[0])
+        keys = [e[0] for e in entries]
+        postings = [(e[1], e[2], e[3]) for e in entries]
+        self._index = (keys, postings, places)
+        self.version = version
+
+    def ensure_fresh(self, force: bool = False) -> None:
+        """
+        Rebuild if places changed since the last build (including ingests run
+        from another process). The change-log check is throttled to once every
+        FRESHNESS_CHECK_INTERVAL_S unless `force` is set.
+        """
+        now = time.monotonic()
+        if not force and now - self._checked_at < FRESHNESS_CHECK_INTERVAL_S:
+            return
+
+        with self._lock:
+            if not force and now - self._checked_at < FRESHNESS_CHECK_INTERVAL_S:
+                return
+            conn = get_conn()
+            try:
+                if _data_version(conn) != self.version:
+                    self.build(conn)
+            finally:
+                conn.close()
+            self._checked_at = time.monotonic()
+
+    def suggest(
+        self,
+        prefix: str,
+        limit: int = 10,
+        category: Optional[str] = None,
+        latitude: Optional[float] = None,
+        longitude: Optional[float] = None,
+    ) -> list[dict]:
+        q = fold_text(prefix)
+        if not q:
+            return []
+
+        # One attribute read, so a concurrent rebuild cannot mix old and new arrays.
+        keys, postings, places = self._index
+
+        best: dict[int, tuple[float, str]] = {}
+        i = bisect_left(keys, q)
+        end = min(len(keys), i + MAX_SCAN)
+        while i < end and keys[i].startswith(q):
+            idx, field, at_start = postings[i]
+            i += 1
+            place = places[idx]
+            if category and place["category"] != category:
+                continue
+            score = FIELD_WEIGHTS[field] + (FIELD_START_BONUS if at_start else 0.0)
+            prev = best.get(idx)
+            if prev is None or score > prev[0]:
+                best[idx] = (score, field)
+
+        has_origin = latitude is not None and longitude is not None
+        out = []
+        for idx, (score, field) in best.items():
+            place = places[idx]
+            distance = None
+            if has_origin and place["latitude"] is not None and place["longitude"] is not None:
+                distance = haversine_km(latitude, longitude, place["latitude"], place["longitude"])
+                score += PROXIMITY_WEIGHT * 0.5 ** (distance / PROXIMITY_SCALE_KM)
+            out.append(
+                {
+                    "text": place[field],
+                    "field": field,
+                    "place_id": place["id"],
+                    "name": place["name"],
+                    "category": place["category"],
+                    "distance_km": round(distance, 3) if distance is not None else None,
+                    "score": round(score, 4),
+                }
+            )
+
+        out.sort(key=lambda s: (-s["score"], s["name"]))
+
+        # Several programs often share a name or address; show each completion once.
+        seen: set[tuple[str, str]] = set()
+        unique = []
+        for s in out:
+            key = (s["field"], s["text"])
+            if key in seen:
+                continue
+            seen.add(key)
+            unique.append(s)
+            if len(unique) >= limit:
+                break
+        return unique
+
+
+def _data_version(conn) -> int:
+    return conn.execute("SELECT COALESCE(MAX(seq), 0) FROM place_changes").fetchone()[0]
+
+
+suggest_index = SuggestIndex()